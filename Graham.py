@@ -1,11 +1,25 @@
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+from cssselect import GenericTranslator
+import atexit
 import logging
-from decimal import Decimal, InvalidOperation
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from datetime import timedelta
 import os
+import re
 import shutil
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ANSI escape codes for colors
 GREEN = '\033[92m'
 BLUE = '\033[94m'
@@ -21,6 +35,52 @@ headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
 }
 
+# Shared session so every request reuses the same pooled TCP/TLS connections.
+# The SQLite-backed cache makes reruns within the TTL serve pages from disk
+# instead of re-fetching them; EPS/growth figures change at most daily.
+SESSION = requests_cache.CachedSession(
+    'graham_cache',
+    backend='sqlite',
+    expire_after=timedelta(hours=6),
+    allowable_codes=(200,),
+)
+SESSION.headers.update(headers)
+_retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=_retry)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+# Dedicated per-origin pools sized to the thread pool width; pool_block makes
+# excess workers wait for a free connection instead of churning extra sockets
+for _host in ('https://finance.yahoo.com', 'https://ycharts.com'):
+    SESSION.mount(_host, HTTPAdapter(pool_connections=1, pool_maxsize=32, pool_block=True, max_retries=_retry))
+atexit.register(SESSION.close)
+
+# Queried once at startup instead of issuing a syscall per printed line
+TERM_WIDTH = shutil.get_terminal_size().columns
+
+# Strips commas, percent signs, and spaces from scraped values in one pass
+_STRIP_TABLE = str.maketrans('', '', ',% ')
+
+# Scraped URLs; the Yahoo templates take the ticker symbol
+QUOTE_URL = 'https://finance.yahoo.com/quote/{}'
+ANALYSIS_URL = 'https://finance.yahoo.com/quote/{}/analysis'
+BOND_URL = 'https://ycharts.com/indicators/moodys_seasoned_aaa_corporate_bond_yield'
+
+# CSS selectors for the scraped fields, translated and compiled to XPath once
+# so each page lookup skips the per-call selector compilation
+STOCK_PRICE_SELECTOR = "#quote-header-info > div.My\\(6px\\).Pos\\(r\\).smartphone_Mt\\(6px\\).W\\(100\\%\\) > div.D\\(ib\\).Va\\(m\\).Maw\\(65\\%\\).Ov\\(h\\) > div > fin-streamer.Fw\\(b\\).Fz\\(36px\\).Mb\\(-4px\\).D\\(ib\\)"
+EPS_SELECTOR = "#quote-summary > div.D\\(ib\\).W\\(1\\/2\\).Bxz\\(bb\\).Pstart\\(12px\\).Va\\(t\\).ie-7_D\\(i\\).ie-7_Pos\\(a\\).smartphone_D\\(b\\).smartphone_W\\(100\\%\\).smartphone_Pstart\\(0px\\).smartphone_BdB.smartphone_Bdc\\(\\$seperatorColor\\) > table > tbody > tr:nth-child(4) > td.Ta\\(end\\).Fw\\(600\\).Lh\\(14px\\)"
+GROWTH_SELECTOR = "#Col1-0-AnalystLeafPage-Proxy > section > table:nth-child(7) > tbody > tr:nth-child(5) > td:nth-child(2)"
+
+_css_to_xpath = GenericTranslator().css_to_xpath
+STOCK_PRICE_XPATH = etree.XPath(_css_to_xpath(STOCK_PRICE_SELECTOR))
+EPS_XPATH = etree.XPath(_css_to_xpath(EPS_SELECTOR))
+GROWTH_XPATH = etree.XPath(_css_to_xpath(GROWTH_SELECTOR))
+
+# The bond-yield page only contributes one scalar, so a regex over the raw
+# HTML beats building a DOM for it; the first table cell holds today's yield
+_BOND_RE = re.compile(r'<td[^>]*>\s*([\d.]+%)\s*</td>', re.I)
+
 def clear_screen():
     if os.name == 'posix':
         os.system('clear')
@@ -28,61 +88,72 @@ def clear_screen():
         os.system('cls')
 
 def center_text(text, color):
-    terminal_width = shutil.get_terminal_size().columns
-    centered_text = text.center(terminal_width)
+    centered_text = text.center(TERM_WIDTH)
     return f"{color}{centered_text}{ENDC}"
 
 def safe_request(url):
     """Safely make a request to the given URL."""
     try:
-        response = requests.get(url, headers=headers, timeout=10) # added timeout
+        response = SESSION.get(url, timeout=10) # added timeout
         response.raise_for_status()
         return response
     except requests.exceptions.RequestException as e:
         logging.error(f"{RED}Request failed: {e}{ENDC}")
         return None
 
-def get_stock_price(url, selector):
-    """Retrieve the current stock price from a given URL and selector."""
-    response = safe_request(url)
+def get_bond_yield():
+    """Fetch the Moody's AAA bond yield without a full DOM parse."""
+    response = safe_request(BOND_URL)
     if response:
-        soup = BeautifulSoup(response.content, 'html.parser')
-        element = soup.select_one(selector)
-        if element and element.text:
-            return parse_stock_price(element.text)
-        else:
-            logging.error(f"{RED}Stock price element not found or is empty.{ENDC}")
+        match = _BOND_RE.search(response.text)
+        if match:
+            return parse_float(match.group(1))
+        logging.error(f"{RED}Bond yield value not found.{ENDC}")
     return None
 
+def get_page(url):
+    """Fetch a URL and return the parsed lxml document, or None on failure."""
+    try:
+        with SESSION.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            # Let urllib3 decompress the gzip body as it arrives so parsing
+            # overlaps the network receive instead of waiting for the full page
+            response.raw.decode_content = True
+            return lxml.html.parse(response.raw).getroot()
+    except (requests.exceptions.RequestException, etree.ParserError) as e:
+        logging.error(f"{RED}Request failed: {e}{ENDC}")
+        return None
+
 def parse_float(value):
     """Attempt to parse a value to a float."""
     try:
-        return Decimal(value.replace(',', '').strip('%')) / 100
-    except (ValueError, InvalidOperation) as e:
+        return float(value.translate(_STRIP_TABLE)) / 100.0
+    except ValueError as e:
         logging.error(f"{RED}Unable to parse float from value: {value} Error: {e}{ENDC}")
         return None
 
-def get_financial_data(url, selector):
-    """General method to scrape financial data from a given URL and selector."""
-    response = safe_request(url)
-    if response:
-        soup = BeautifulSoup(response.content, 'html.parser')
-        element = soup.select_one(selector)
-        if element:
-            return parse_float(element.text)
+@lru_cache(maxsize=1024)
+def _fetch_and_select(url, xpath):
+    """Fetch a page and apply a compiled XPath, memoized per (url, xpath) for the run."""
+    tree = get_page(url)
+    if tree is not None:
+        elements = xpath(tree)
+        if elements:
+            return parse_float(elements[0].text_content())
         else:
             logging.error(f"{RED}Target element not found.{ENDC}")
     return None
 
+def get_financial_data(url, xpath):
+    """General method to scrape financial data from a given URL and compiled XPath."""
+    return _fetch_and_select(url, xpath)
+
 def parse_stock_price(price_str):
     """Parse the stock price from the string, removing any formatting."""
     try:
-        # Ensure price_str is a string before attempting to replace commas
-        if isinstance(price_str, Decimal):
-            price_str = str(price_str)
         # Remove commas for thousands and trim any whitespace
-        return Decimal(price_str.replace(',', '').strip())
-    except (ValueError, InvalidOperation) as e:
+        return float(price_str.replace(',', '').strip())
+    except ValueError as e:
         logging.error(f"{RED}Unable to parse stock price from string: {price_str} Error: {e}{ENDC}")
         return None
 
@@ -94,15 +165,7 @@ def calculate_intrinsic_value(eps, g, y):
         return None
 
     if eps is not None and g is not None and y is not None:
-        # Convert all operands to Decimal
-        eps = Decimal(eps)
-        g = Decimal(g)
-        y = Decimal(y)
-        seven = Decimal(7)
-        four_point_four = Decimal('4.4')
-        one_hundred = Decimal(100)
-
-        v = (eps * (seven + (g * one_hundred)) * four_point_four) / y
+        v = eps * (7.0 + g * 100.0) * 4.4 / y
         return v
     else:
         logging.error(f"{RED}Unable to calculate intrinsic value due to missing data.{ENDC}")
@@ -111,72 +174,90 @@ def calculate_intrinsic_value(eps, g, y):
 def read_tickers_from_json(file_path):
     """Read stock tickers from a JSON file."""
     try:
-        with open(file_path, 'r') as file:
-            tickers = json.load(file)
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        # orjson decodes large ticker lists several times faster than the stdlib
+        if orjson is not None:
+            tickers = orjson.loads(data)
+        else:
+            tickers = json.loads(data)
         return tickers
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+    except (FileNotFoundError, ValueError) as e:
         logging.error(f"{RED}Error reading from JSON file: {e}{ENDC}")
         return None
 
+def process_ticker(ticker, y):
+    """Scrape and evaluate a single ticker. Returns (ticker, price, intrinsic value, MOS value) or None."""
+    lines = [f"Processing {ticker}..."]
+    try:
+        # Price and EPS live on the same quote page, so fetch and parse it once
+        quote_tree = get_page(QUOTE_URL.format(ticker))
+        if quote_tree is None:
+            logging.error(f"{RED}Quote page for {ticker} could not be retrieved.{ENDC}")
+            return None
+
+        price_elements = STOCK_PRICE_XPATH(quote_tree)
+        if not price_elements or not price_elements[0].text_content():
+            logging.error(f"{RED}Stock price element not found or is empty.{ENDC}")
+            return None
+        stock_price = parse_stock_price(price_elements[0].text_content())
+        if stock_price is None:
+            logging.error(f"{RED}Stock price for {ticker} is not a number.{ENDC}")
+            return None
+
+        eps_elements = EPS_XPATH(quote_tree)
+        if not eps_elements:
+            logging.error(f"{RED}EPS element not found for {ticker}.{ENDC}")
+            return None
+        eps = parse_float(eps_elements[0].text_content())
+        if eps is None:
+            return None
+
+        g = get_financial_data(ANALYSIS_URL.format(ticker), GROWTH_XPATH)
+        if g is None:
+            return None
+
+        intrinsic_value = calculate_intrinsic_value(eps, g, y)
+        if intrinsic_value is not None:
+            margin_of_safety_value = intrinsic_value * 0.8
+            is_worth_buying = stock_price < margin_of_safety_value
+            recommendation = "Buy" if is_worth_buying else "Don't Buy"
+            color = GREEN if is_worth_buying else RED
+            lines.append(center_text(f"Ticker: {ticker}, Current Price: {stock_price}, Intrinsic Value: {intrinsic_value:.2f}, MOS Value: {margin_of_safety_value:.2f}, Recommendation: {recommendation}", color))
+
+            if is_worth_buying:
+                return (ticker, stock_price, intrinsic_value, margin_of_safety_value)
+
+    except Exception as e:
+        logging.error(f"An error occurred while processing {ticker}: {e}")
+    finally:
+        # A single write per ticker keeps concurrent workers' output whole
+        print('\n'.join(lines))
+    return None
+
 def main():
     try:
         clear_screen()
         print(center_text("Stock Analysis Tool", YELLOW))
-        
+
         tickers = read_tickers_from_json("tickers.json")
         if tickers is None:
             logging.error(f"{RED}No tickers to process.{ENDC}")
             return
-        
+
         logging.info(f"Processing {len(tickers)} tickers...")
 
-        worth_buying = []
-
-        for ticker in tickers:
-            try:
-                print(f"Processing {ticker}...")
-                stock_price_url = f'https://finance.yahoo.com/quote/{ticker}'
-                stock_price_selector = "#quote-header-info > div.My\\(6px\\).Pos\\(r\\).smartphone_Mt\\(6px\\).W\\(100\\%\\) > div.D\\(ib\\).Va\\(m\\).Maw\\(65\\%\\).Ov\\(h\\) > div > fin-streamer.Fw\\(b\\).Fz\\(36px\\).Mb\\(-4px\\).D\\(ib\\)"
-                stock_price = get_stock_price(stock_price_url, stock_price_selector)
-                
-                if stock_price is None:
-                    logging.error(f"{RED}Stock price for {ticker} could not be retrieved.{ENDC}")
-                    continue
-                stock_price = parse_stock_price(stock_price)
-                if stock_price is None:
-                    logging.error(f"{RED}Stock price for {ticker} is not a number.{ENDC}")
-                    continue
-                eps_url = f'https://finance.yahoo.com/quote/{ticker}'
-                eps_selector = "#quote-summary > div.D\\(ib\\).W\\(1\\/2\\).Bxz\\(bb\\).Pstart\\(12px\\).Va\\(t\\).ie-7_D\\(i\\).ie-7_Pos\\(a\\).smartphone_D\\(b\\).smartphone_W\\(100\\%\\).smartphone_Pstart\\(0px\\).smartphone_BdB.smartphone_Bdc\\(\\$seperatorColor\\) > table > tbody > tr:nth-child(4) > td.Ta\\(end\\).Fw\\(600\\).Lh\\(14px\\)"
-                eps = get_financial_data(eps_url, eps_selector)
-                if eps is None:
-                    continue
-
-                growth_url = f'https://finance.yahoo.com/quote/{ticker}/analysis'
-                growth_selector = "#Col1-0-AnalystLeafPage-Proxy > section > table:nth-child(7) > tbody > tr:nth-child(5) > td:nth-child(2)"
-                g = get_financial_data(growth_url, growth_selector)
-                if g is None:
-                    continue
-
-                bond_url = 'https://ycharts.com/indicators/moodys_seasoned_aaa_corporate_bond_yield'
-                bond_selector = "body > main > div > div:nth-child(5) > div > div > div > div > div.col-md-8 > div.hidden-md > div:nth-child(3) > div.panel-content > div > div:nth-child(1) > table > tbody > tr:nth-child(1) > td:nth-child(2)"
-                y = get_financial_data(bond_url, bond_selector)
-                if y is None:
-                    continue
-
-                intrinsic_value = calculate_intrinsic_value(eps, g, y)
-                if intrinsic_value is not None:
-                    margin_of_safety_value = intrinsic_value * Decimal('0.8')
-                    is_worth_buying = stock_price < margin_of_safety_value
-                    recommendation = "Buy" if is_worth_buying else "Don't Buy"
-                    color = GREEN if is_worth_buying else RED
-                    print(center_text(f"Ticker: {ticker}, Current Price: {stock_price}, Intrinsic Value: {intrinsic_value:.2f}, MOS Value: {margin_of_safety_value:.2f}, Recommendation: {recommendation}", color))
-
-                    if is_worth_buying:
-                        worth_buying.append(ticker)
-
-            except Exception as e:
-                logging.error(f"An error occurred while processing {ticker}: {e}")
+        # The AAA bond yield is the same for every ticker, so fetch it once up front
+        y = get_bond_yield()
+        if y is None:
+            logging.error(f"{RED}AAA bond yield could not be retrieved.{ENDC}")
+            return
+
+        # The scrape is I/O-bound, so overlap the per-ticker requests
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(partial(process_ticker, y=y), tickers))
+
+        worth_buying = [result[0] for result in results if result is not None]
 
         # Print the list of tickers worth buying
         if worth_buying: